@@ -2,6 +2,7 @@ import math
 import copy
 import pygame
 import sys
+from array import array
 
 # Initialize pygame
 pygame.init()
@@ -23,6 +24,20 @@ MOVE_HIGHLIGHT = (214, 214, 189)
 BUTTON_COLOR = (70, 130, 180)
 BUTTON_HOVER_COLOR = (100, 149, 237)
 
+# Move encoding
+# A move is packed into a 16-bit integer:
+#   bits 0-5   from square (row * 8 + col)
+#   bits 6-11  to square (row * 8 + col)
+#   bits 12-15 promotion code (index into PROMOTION_PIECES, 0 = no promotion)
+PROMOTION_PIECES = (None, 'Q', 'R', 'B', 'N', 'q', 'r', 'b', 'n')
+PROMOTION_CODES = {piece: code for code, piece in enumerate(PROMOTION_PIECES) if piece}
+
+# Preallocated move buffers, one per search depth. minimax() at remaining depth d
+# writes into MOVE_BUFFERS[d]; MOVE_BUFFERS[0] is free for the GUI and game_over().
+MAX_MOVES = 256
+MAX_DEPTH = 8
+MOVE_BUFFERS = [array('H', [0]) * MAX_MOVES for _ in range(MAX_DEPTH + 1)]
+
 def load_images():
     images = {}
     pieces = ['K', 'Q', 'R', 'B', 'N', 'P']
@@ -65,6 +80,19 @@ def is_friend(piece, color):
     else:
         return piece.islower()
 
+def encode_move(fr, fc, tr, tc, promo=None):
+    # Pack (from_row, from_col, to_row, to_col, promotion) into a 16-bit move integer.
+    move = (fr * 8 + fc) | (tr * 8 + tc) << 6
+    if promo:
+        move |= PROMOTION_CODES[promo] << 12
+    return move
+
+def decode_move(move):
+    # Unpack a move integer into a tuple: (from_row, from_col, to_row, to_col, promotion)
+    fr, fc = divmod(move & 63, 8)
+    tr, tc = divmod((move >> 6) & 63, 8)
+    return (fr, fc, tr, tc, PROMOTION_PIECES[move >> 12])
+
 def board_to_string(board):
     # Convert the board to a string representation for comparing positions
     result = ""
@@ -73,14 +101,16 @@ def board_to_string(board):
     return result
 
 def simulate_move(board, move):
-    # Return a new board resulting from applying the move. A move is a tuple: (from_row, from_col, to_row, to_col, promotion)
-    # The promotion field (if not None) should be the piece that the pawn promotes to.
+    # Return a new board resulting from applying the move. A move is a packed integer (see encode_move).
+    # The promotion code (if not zero) selects the piece that the pawn promotes to.
     new_board = copy.deepcopy(board)
-    fr, fc, tr, tc, promo = move
+    fr, fc = divmod(move & 63, 8)
+    tr, tc = divmod((move >> 6) & 63, 8)
+    promo = move >> 12
     piece = new_board[fr][fc]
     new_board[fr][fc] = '.'
     if promo:
-        new_board[tr][tc] = promo
+        new_board[tr][tc] = PROMOTION_PIECES[promo]
     else:
         new_board[tr][tc] = piece
     return new_board
@@ -185,114 +215,131 @@ def is_in_check(board, color):
     enemy_color = 'black' if color == 'white' else 'white'
     return is_square_attacked(board, king_row, king_col, enemy_color)
 
-def generate_moves(board, color):
-    # Generate all *legal* moves for the given color.
-    # A move is represented as a tuple: (from_row, from_col, to_row, to_col, promotion)
-    # where promotion is either None or (for simplicity) a Queen.
-    moves = []
+def generate_moves(board, color, moves):
+    # Generate all *legal* moves for the given color into the array buffer `moves`
+    # and return how many were written. Moves are packed integers (see encode_move);
+    # promotion is either none or (for simplicity) a Queen.
+    n = 0
     for i in range(8):
         for j in range(8):
             piece = board[i][j]
             if piece == '.':
                 continue
             if color == 'white' and piece.isupper():
-                moves.extend(generate_piece_moves(board, i, j, color))
+                n = generate_piece_moves(board, i, j, color, moves, n)
             elif color == 'black' and piece.islower():
-                moves.extend(generate_piece_moves(board, i, j, color))
-    # Filter out moves that leave the king in check
-    legal_moves = []
-    for move in moves:
+                n = generate_piece_moves(board, i, j, color, moves, n)
+    # Filter out moves that leave the king in check, compacting the buffer in place
+    count = 0
+    for k in range(n):
+        move = moves[k]
         new_board = simulate_move(board, move)
         if not is_in_check(new_board, color):
-            legal_moves.append(move)
-    return legal_moves
-
-def generate_piece_moves(board, i, j, color):
+            moves[count] = move
+            count += 1
+    return count
+
+def moves_from_square(board, color, row, col):
+    # Return the legal moves (as a list) of the piece at (row, col).
+    moves = MOVE_BUFFERS[0]
+    n = generate_moves(board, color, moves)
+    square = row * 8 + col
+    return [moves[k] for k in range(n) if moves[k] & 63 == square]
+
+def generate_piece_moves(board, i, j, color, moves, n):
     # Generate pseudo-legal moves (without king safety check) for the piece at (i,j).
+    # Moves are written into `moves` starting at index n; the new count is returned.
     piece = board[i][j]
-    moves = []
     piece_type = piece.upper()
     if piece_type == 'P':
-        moves.extend(generate_pawn_moves(board, i, j, color))
+        n = generate_pawn_moves(board, i, j, color, moves, n)
     elif piece_type == 'N':
-        moves.extend(generate_knight_moves(board, i, j, color))
+        n = generate_knight_moves(board, i, j, color, moves, n)
     elif piece_type == 'B':
-        moves.extend(generate_sliding_moves(board, i, j, color, [(-1,-1), (-1,1), (1,-1), (1,1)]))
+        n = generate_sliding_moves(board, i, j, color, [(-1,-1), (-1,1), (1,-1), (1,1)], moves, n)
     elif piece_type == 'R':
-        moves.extend(generate_sliding_moves(board, i, j, color, [(-1,0), (1,0), (0,-1), (0,1)]))
+        n = generate_sliding_moves(board, i, j, color, [(-1,0), (1,0), (0,-1), (0,1)], moves, n)
     elif piece_type == 'Q':
-        moves.extend(generate_sliding_moves(board, i, j, color,
-                                             [(-1,-1), (-1,1), (1,-1), (1,1),
-                                              (-1,0), (1,0), (0,-1), (0,1)]))
+        n = generate_sliding_moves(board, i, j, color,
+                                   [(-1,-1), (-1,1), (1,-1), (1,1),
+                                    (-1,0), (1,0), (0,-1), (0,1)], moves, n)
     elif piece_type == 'K':
-        moves.extend(generate_king_moves(board, i, j, color))
-    return moves
+        n = generate_king_moves(board, i, j, color, moves, n)
+    return n
 
-def generate_pawn_moves(board, i, j, color):
-    moves = []
+def generate_pawn_moves(board, i, j, color, moves, n):
     if color == 'white':
         direction = -1
         start_row = 6
         promotion_row = 0
+        promo = PROMOTION_CODES['Q'] << 12
     else:
         direction = 1
         start_row = 1
         promotion_row = 7
+        promo = PROMOTION_CODES['q'] << 12
+    from_sq = i * 8 + j
     new_i = i + direction
     # One square forward
     if is_inside(new_i, j) and board[new_i][j] == '.':
         if new_i == promotion_row:
-            moves.append((i, j, new_i, j, 'Q' if color=='white' else 'q'))
+            moves[n] = from_sq | (new_i * 8 + j) << 6 | promo
         else:
-            moves.append((i, j, new_i, j, None))
+            moves[n] = from_sq | (new_i * 8 + j) << 6
+        n += 1
         # Two squares forward from starting row
         if i == start_row:
             new_i2 = i + 2 * direction
             if is_inside(new_i2, j) and board[new_i2][j] == '.':
-                moves.append((i, j, new_i2, j, None))
+                moves[n] = from_sq | (new_i2 * 8 + j) << 6
+                n += 1
     # Captures
     for dj in [-1, 1]:
         new_j = j + dj
         if is_inside(new_i, new_j) and board[new_i][new_j] != '.' and is_enemy(board[new_i][new_j], color):
             if new_i == promotion_row:
-                moves.append((i, j, new_i, new_j, 'Q' if color=='white' else 'q'))
+                moves[n] = from_sq | (new_i * 8 + new_j) << 6 | promo
             else:
-                moves.append((i, j, new_i, new_j, None))
-    return moves
+                moves[n] = from_sq | (new_i * 8 + new_j) << 6
+            n += 1
+    return n
 
-def generate_knight_moves(board, i, j, color):
-    moves = []
+def generate_knight_moves(board, i, j, color, moves, n):
     knight_moves = [(2,1), (1,2), (-1,2), (-2,1),
                     (-2,-1), (-1,-2), (1,-2), (2,-1)]
+    from_sq = i * 8 + j
     for dr, dc in knight_moves:
         new_i = i + dr
         new_j = j + dc
         if is_inside(new_i, new_j):
             target = board[new_i][new_j]
             if target == '.' or is_enemy(target, color):
-                moves.append((i, j, new_i, new_j, None))
-    return moves
+                moves[n] = from_sq | (new_i * 8 + new_j) << 6
+                n += 1
+    return n
 
-def generate_sliding_moves(board, i, j, color, directions):
-    moves = []
+def generate_sliding_moves(board, i, j, color, directions, moves, n):
+    from_sq = i * 8 + j
     for dr, dc in directions:
         new_i = i + dr
         new_j = j + dc
         while is_inside(new_i, new_j):
             target = board[new_i][new_j]
             if target == '.':
-                moves.append((i, j, new_i, new_j, None))
+                moves[n] = from_sq | (new_i * 8 + new_j) << 6
+                n += 1
             elif is_enemy(target, color):
-                moves.append((i, j, new_i, new_j, None))
+                moves[n] = from_sq | (new_i * 8 + new_j) << 6
+                n += 1
                 break
             else:
                 break
             new_i += dr
             new_j += dc
-    return moves
+    return n
 
-def generate_king_moves(board, i, j, color):
-    moves = []
+def generate_king_moves(board, i, j, color, moves, n):
+    from_sq = i * 8 + j
     for dr in [-1, 0, 1]:
         for dc in [-1, 0, 1]:
             if dr == 0 and dc == 0:
@@ -302,8 +349,9 @@ def generate_king_moves(board, i, j, color):
             if is_inside(new_i, new_j):
                 target = board[new_i][new_j]
                 if target == '.' or is_enemy(target, color):
-                    moves.append((i, j, new_i, new_j, None))
-    return moves
+                    moves[n] = from_sq | (new_i * 8 + new_j) << 6
+                    n += 1
+    return n
 
 def evaluate_board(board):
     # A simple material-based evaluation.
@@ -324,20 +372,25 @@ def evaluate_board(board):
     return score
 
 def game_over(board, turn):
-    return len(generate_moves(board, turn)) == 0
+    return generate_moves(board, turn, MOVE_BUFFERS[0]) == 0
 
 def minimax(board, turn, depth, alpha, beta):
     # A minimax search with alpha–beta pruning.
     # Since our evaluation is (white – black), White seeks to maximize while Black seeks to minimize.
     # (User is White; AI is Black.)
+    # Moves at each depth are generated into that depth's preallocated buffer.
 
-    if depth == 0 or game_over(board, turn):
+    if depth == 0:
+        return evaluate_board(board), None
+    legal_moves = MOVE_BUFFERS[depth]
+    n = generate_moves(board, turn, legal_moves)
+    if n == 0:
         return evaluate_board(board), None
-    legal_moves = generate_moves(board, turn)
     if turn == 'white':
         max_eval = -math.inf
         best_move = None
-        for move in legal_moves:
+        for k in range(n):
+            move = legal_moves[k]
             new_board = simulate_move(board, move)
             next_turn = 'black'
             eval_score, _ = minimax(new_board, next_turn, depth - 1, alpha, beta)
@@ -351,7 +404,8 @@ def minimax(board, turn, depth, alpha, beta):
     else:  # Black's turn (AI) minimizes the score.
         min_eval = math.inf
         best_move = None
-        for move in legal_moves:
+        for k in range(n):
+            move = legal_moves[k]
             new_board = simulate_move(board, move)
             next_turn = 'white'
             eval_score, _ = minimax(new_board, next_turn, depth - 1, alpha, beta)
@@ -364,22 +418,21 @@ def minimax(board, turn, depth, alpha, beta):
         return min_eval, best_move
 
 def move_to_string(move):
-    # Convert a move tuple back to a string (e.g., 'e2e4' or 'e7e8Q').
+    # Convert a move integer back to a string (e.g., 'e2e4' or 'e7e8Q').
     files = 'abcdefgh'
-    fr, fc, tr, tc, promo = move
+    fr, fc, tr, tc, promo = decode_move(move)
     s = files[fc] + str(8 - fr) + files[tc] + str(8 - tr)
     if promo:
         s += promo.upper()
     return s
 
 def parse_move(from_square, to_square):
-    # Parse a move from GUI coordinates into a move tuple:
-    #   (from_row, from_col, to_row, to_col, promotion)
-    # For simplicity the promotion field is left as None (our move generator automatically adds a Queen promotion when needed).
+    # Parse a move from GUI coordinates into a move integer (see encode_move).
+    # For simplicity no promotion is encoded (our move generator automatically adds a Queen promotion when needed).
 
     from_row, from_col = from_square
     to_row, to_col = to_square
-    return (from_row, from_col, to_row, to_col, None)
+    return encode_move(from_row, from_col, to_row, to_col)
 
 def draw_button(screen, rect, text, font, color, hover_color=None):
     # Draw a button with text
@@ -471,7 +524,7 @@ def draw_board(screen, board, piece_images, selected=None, valid_moves=None, mes
                 color = HIGHLIGHT
                 
             # Highlight valid move squares
-            if valid_moves and (row, col) in [(m[2], m[3]) for m in valid_moves]:
+            if valid_moves and row * 8 + col in [(m >> 6) & 63 for m in valid_moves]:
                 if (row + col) % 2 == 0:
                     color = (208, 220, 178)  # Lighter highlight for light squares
                 else:
@@ -580,18 +633,17 @@ def main():
                             if is_friend(piece, 'white'):
                                 selected = (row, col)
                                 # Get valid moves for the selected piece
-                                all_moves = generate_moves(board, 'white')
-                                valid_moves = [m for m in all_moves if m[0] == row and m[1] == col]
+                                valid_moves = moves_from_square(board, 'white', row, col)
                         else:
                             # If a piece is already selected
                             # Try to make a move
                             move = None
                             for m in valid_moves:
-                                if m[2] == row and m[3] == col:
+                                if (m >> 6) & 63 == row * 8 + col:
                                     move = m
                                     break
                             
-                            if move:
+                            if move is not None:
                                 # Make the move
                                 board = simulate_move(board, move)
                                 selected = None
@@ -618,8 +670,7 @@ def main():
                                 piece = board[row][col]
                                 if is_friend(piece, 'white'):
                                     selected = (row, col)
-                                    all_moves = generate_moves(board, 'white')
-                                    valid_moves = [m for m in all_moves if m[0] == row and m[1] == col]
+                                    valid_moves = moves_from_square(board, 'white', row, col)
                                 else:
                                     selected = None
                                     valid_moves = []
@@ -629,7 +680,7 @@ def main():
             # AI thinks and makes a move
             _, ai_move = minimax(board, 'black', depth=3, alpha=-math.inf, beta=math.inf)
             
-            if ai_move:
+            if ai_move is not None:
                 # Make the AI's move
                 board = simulate_move(board, ai_move)
                 game_message = f"AI moved: {move_to_string(ai_move)}"